@@ -1,18 +1,26 @@
 import re, sys
 
+try:
+    import re2 as regex_engine  # google-re2: linear-time multi-pattern DFA
+except ImportError:
+    regex_engine = re
+
 word_file = open("word_based_bias_list.csv").readlines()
 
 words = []
 for i in word_file[1:]:
     words.append(i.split(',')[0])
 
+# One alternation compiled once, so each line is scanned in a single pass
+# over all the words instead of one compile + scan per line x word pair.
+# The entries are regex patterns themselves (e.g. "gays?", "jew\w*"), so
+# they are joined as-is, not escaped.
+pattern = regex_engine.compile("|".join(words))
+
 f = open(sys.argv[1])
 fw = open(sys.argv[2], 'w')
 for line in f:
-    for word in words:
-        gex = re.compile(word)
-        find = gex.findall(line)
-        if len(find)>0:
-            print(find)
-        line = re.sub(word, '', line)
-    fw.write(line)
+    finds = pattern.findall(line)
+    if len(finds) > 0:
+        print(finds)
+    fw.write(pattern.sub('', line))
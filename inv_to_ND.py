@@ -1,17 +1,27 @@
 import sys
 import csv
+from itertools import zip_longest
 
-c = list(csv.reader(open(sys.argv[2])))
+with open(sys.argv[1]) as fp, open(sys.argv[2]) as fc, open(sys.argv[3], 'w', newline='') as fo:
+    preds = csv.reader(fp)
+    c = csv.reader(fc)
+    w = csv.writer(fo)
 
-preds = list(csv.reader(open(sys.argv[1])))
-c[0].append('invariant')
-c[0].append('variant')
-print(len(preds))
-for i in range(1, len(c)):
-    pred = preds[i-1][0].split('\t')
-    c[i].append(pred[1])
-    c[i].append(pred[2])
+    header = next(c)
+    header.append('invariant')
+    header.append('variant')
+    w.writerow(header)
 
-w = csv.writer(open(sys.argv[3], 'w'))
-for i in c:
-    w.writerow(i)
+    n = 0
+    # zip_longest pads the shorter file with None; a plain zip would stop
+    # there and write a silently incomplete CSV on a row-count mismatch.
+    for row, pred_row in zip_longest(c, preds):
+        if row is None or pred_row is None:
+            raise ValueError("%s and %s have different row counts (merged %d rows)"
+                             % (sys.argv[1], sys.argv[2], n))
+        pred = pred_row[0].split('\t')
+        row.append(pred[1])
+        row.append(pred[2])
+        w.writerow(row)
+        n += 1
+    print(n)
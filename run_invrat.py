@@ -24,6 +24,7 @@
 
 import argparse
 import glob
+import hashlib
 import json
 import logging
 import os
@@ -141,7 +142,13 @@ def train(args, train_dataset, models, tokenizer):
 
     args.train_batch_size = args.per_gpu_train_batch_size * max(1, args.n_gpu)
     train_sampler = RandomSampler(train_dataset) if args.local_rank == -1 else DistributedSampler(train_dataset)
-    train_dataloader = DataLoader(train_dataset, sampler=train_sampler, batch_size=args.train_batch_size)
+    train_dataloader = DataLoader(
+        train_dataset,
+        sampler=train_sampler,
+        batch_size=args.train_batch_size,
+        num_workers=args.dataloader_num_workers,
+        pin_memory=args.device.type == "cuda",
+    )
 
     if args.max_steps > 0:
         t_total = args.max_steps
@@ -408,7 +415,13 @@ def evaluate(args, models, tokenizer, prefix=""):
             # Note that DistributedSampler samples randomly
             eval_sampler = SequentialSampler(eval_dataset)
             #eval_dataloader = DataLoader(eval_dataset, sampler=eval_sampler, batch_size=args.eval_batch_size)
-            eval_dataloader = DataLoader(eval_dataset, shuffle=False, batch_size=args.eval_batch_size)
+            eval_dataloader = DataLoader(
+                eval_dataset,
+                shuffle=False,
+                batch_size=args.eval_batch_size,
+                num_workers=args.dataloader_num_workers,
+                pin_memory=args.device.type == "cuda",
+            )
 
             # multi-gpu eval
             if args.n_gpu > 1:
@@ -544,20 +557,36 @@ def load_and_cache_examples(args, task, tokenizer, evaluate=False, eval_set='dev
 
     processor = processors[task]()
     output_mode = output_modes[task]
-    # Load data features from cache or dataset file
-    cached_features_file = os.path.join(
-        args.data_dir,
-        "cached_{}_{}_{}_{}_{}".format(
-            eval_set if evaluate else "train",
+    # Load data features from cache or dataset file. The cache holds one .npy
+    # file per feature column so it can be memory-mapped back without
+    # re-tokenizing, keyed by a fingerprint over the tokenizer, the sequence
+    # length and the source file mtimes.
+    if args.eval_data_dir != None:
+        src_paths = [args.eval_data_dir]
+    else:
+        src_paths = sorted(glob.glob(os.path.join(args.data_dir, "*.csv")))
+    data_mtime = max((os.path.getmtime(p) for p in src_paths), default=0)
+    fingerprint = hashlib.sha1(
+        "{}|{}|{}|{}|{}".format(
             list(filter(None, args.model_name_or_path.split("/"))).pop(),
             str(args.max_seq_length),
             str(task),
             str(args.env_type),
-        ),
+            data_mtime,
+        ).encode()
+    ).hexdigest()[:12]
+    cached_features_dir = os.path.join(
+        args.data_dir,
+        "cached_{}_{}".format(eval_set if evaluate else "train", fingerprint),
     )
-    if os.path.exists(cached_features_file) and not args.overwrite_cache:
-        logger.info("Loading features from cached file %s", cached_features_file)
-        features = torch.load(cached_features_file)
+    cached_arrays = {
+        name: os.path.join(cached_features_dir, name + ".npy")
+        for name in ("input_ids", "attention_mask", "token_type_ids", "labels")
+    }
+    if all(os.path.exists(p) for p in cached_arrays.values()) and not args.overwrite_cache:
+        logger.info("Loading features from cached arrays in %s", cached_features_dir)
+        # r+ keeps the mapping writeable so torch.from_numpy can share it.
+        arrays = {name: np.load(p, mmap_mode="r+") for name, p in cached_arrays.items()}
     else:
         logger.info("Creating features from dataset file at %s", args.data_dir)
         label_list = processor.get_labels()
@@ -589,21 +618,33 @@ def load_and_cache_examples(args, task, tokenizer, evaluate=False, eval_set='dev
             pad_token=tokenizer.convert_tokens_to_ids([tokenizer.pad_token])[0],
             pad_token_segment_id=4 if args.model_type in ["xlnet"] else 0,
         )
+        arrays = {
+            "input_ids": np.asarray([f.input_ids for f in features], dtype=np.int64),
+            "attention_mask": np.asarray([f.attention_mask for f in features], dtype=np.int64),
+            "token_type_ids": np.asarray([f.token_type_ids for f in features], dtype=np.int64),
+            "labels": np.asarray(
+                [f.label for f in features],
+                dtype=np.int64 if output_mode == "classification" else np.float32,
+            ),
+        }
         if args.local_rank in [-1, 0]:
-            logger.info("Saving features into cached file %s", cached_features_file)
-            torch.save(features, cached_features_file)
+            logger.info("Saving feature arrays into cached dir %s", cached_features_dir)
+            os.makedirs(cached_features_dir, exist_ok=True)
+            for name, p in cached_arrays.items():
+                np.save(p, arrays[name])
+            # Re-open through the memory map so DataLoader workers attach to
+            # the same kernel pages instead of fork-copying the heap arrays.
+            arrays = {name: np.load(p, mmap_mode="r+") for name, p in cached_arrays.items()}
 
     if args.local_rank == 0 and not evaluate:
         torch.distributed.barrier()  # Make sure only the first process in distributed training process the dataset, and the others will use the cache
 
-    # Convert to Tensors and build dataset
-    all_input_ids = torch.tensor([f.input_ids for f in features], dtype=torch.long)
-    all_attention_mask = torch.tensor([f.attention_mask for f in features], dtype=torch.long)
-    all_token_type_ids = torch.tensor([f.token_type_ids for f in features], dtype=torch.long)
-    if output_mode == "classification":
-        all_labels = torch.tensor([f.label for f in features], dtype=torch.long)
-    elif output_mode == "regression":
-        all_labels = torch.tensor([f.label for f in features], dtype=torch.float)
+    # Convert to Tensors and build dataset. from_numpy shares the (possibly
+    # memory-mapped) buffers instead of copying them.
+    all_input_ids = torch.from_numpy(arrays["input_ids"])
+    all_attention_mask = torch.from_numpy(arrays["attention_mask"])
+    all_token_type_ids = torch.from_numpy(arrays["token_type_ids"])
+    all_labels = torch.from_numpy(arrays["labels"])
     if args.ensemble_bias and not evaluate:
         all_bias = load_bias(args)
         all_bias = torch.tensor([b for b in all_bias], dtype=torch.float)
@@ -767,6 +808,12 @@ def main():
     parser.add_argument(
         "--overwrite_cache", action="store_true", help="Overwrite the cached training and evaluation sets",
     )
+    parser.add_argument(
+        "--dataloader_num_workers",
+        default=min(os.cpu_count() or 1, 8),
+        type=int,
+        help="Number of DataLoader worker processes. The feature tensors are memory-mapped, so workers attach to the same pages instead of copying them.",
+    )
     parser.add_argument("--seed", type=int, default=42, help="random seed for initialization")
 
     parser.add_argument(
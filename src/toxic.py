@@ -20,23 +20,60 @@
 # limitations under the License.
 """ Toxic language data processors and helpers """
 
+import functools
 import logging
 import os
 import re
 import csv
-import copy
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
 import json
 
 from transformers import is_tf_available
 from transformers import DataProcessor, InputExample, InputFeatures
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
-if is_tf_available():
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_IS_TF = is_tf_available()
+if _IS_TF:
     import tensorflow as tf
 
 logger = logging.getLogger(__name__)
 
+
+def _stamp_token_type_ids(attention_mask, envs, pad_token_segment_id):
+    """Fills each row of token_type_ids with the example's environment id on
+    real-token positions and pad_token_segment_id on padding."""
+    return np.where(attention_mask.astype(bool), envs[:, None], pad_token_segment_id).astype(np.int32)
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _stamp_token_type_ids(attention_mask, envs, pad_token_segment_id):  # noqa: F811
+        out = np.empty(attention_mask.shape, dtype=np.int32)
+        for i in prange(envs.shape[0]):
+            for j in range(attention_mask.shape[1]):
+                if attention_mask[i, j] != 0:
+                    out[i, j] = envs[i]
+                else:
+                    out[i, j] = pad_token_segment_id
+        return out
+
+
 class EnvInputExample(object):
     """
     A single training/test example for simple sequence classification.
@@ -50,6 +87,8 @@ class EnvInputExample(object):
         label: (Optional) string. The label of the example. This should be
         specified for train and dev examples, but not for test examples.
     """
+    __slots__ = ('guid', 'text_a', 'text_b', 'label', 'env')
+
     def __init__(self, guid, text_a, text_b=None, label=None, env=None):
         self.guid = guid
         self.text_a = text_a
@@ -58,18 +97,53 @@ class EnvInputExample(object):
         self.env = env
 
     def __repr__(self):
-        return str(self.to_json_string())
+        return "EnvInputExample(guid=%r, env=%r, label=%r)" % (self.guid, self.env, self.label)
 
     def to_dict(self):
         """Serializes this instance to a Python dictionary."""
-        output = copy.deepcopy(self.__dict__)
-        return output
+        return {'guid': self.guid, 'text_a': self.text_a, 'text_b': self.text_b,
+                'label': self.label, 'env': self.env}
 
     def to_json_string(self):
         """Serializes this instance to a JSON string."""
+        if orjson is not None:
+            return orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode() + "\n"
         return json.dumps(self.to_dict(), indent=2, sort_keys=True) + "\n"
 
 
+class ExampleBatch(object):
+    """
+    Structure-of-arrays view of a set of examples: one column per field
+    instead of one Python object per example, so the batched tokenizer and
+    the vectorized feature assembly can consume the columns directly.
+    """
+    __slots__ = ('guids', 'texts_a', 'texts_b', 'labels', 'envs')
+
+    def __init__(self, guids, texts_a, texts_b=None, labels=None, envs=None):
+        self.guids = guids
+        self.texts_a = texts_a
+        self.texts_b = texts_b
+        self.labels = labels
+        self.envs = envs
+
+    def __len__(self):
+        return len(self.texts_a)
+
+    @classmethod
+    def from_examples(cls, examples):
+        """Builds the column batch from a list of ``EnvInputExample``."""
+        texts_b = [example.text_b for example in examples]
+        if all(text_b is None for text_b in texts_b):
+            texts_b = None
+        return cls(
+            guids=[example.guid for example in examples],
+            texts_a=[example.text_a for example in examples],
+            texts_b=texts_b,
+            labels=[example.label for example in examples],
+            envs=np.fromiter((example.env for example in examples), dtype=np.int32, count=len(examples)),
+        )
+
+
 def glue_convert_examples_to_features(examples, tokenizer,
                                       max_length=512,
                                       task=None,
@@ -83,7 +157,7 @@ def glue_convert_examples_to_features(examples, tokenizer,
     Loads a data file into a list of ``InputFeatures``
 
     Args:
-        examples: List of ``InputExamples`` or ``tf.data.Dataset`` containing the examples.
+        examples: ``ExampleBatch``, list of ``InputExamples`` or ``tf.data.Dataset`` containing the examples.
         tokenizer: Instance of a tokenizer that will tokenize the examples
         max_length: Maximum example length
         task: GLUE task
@@ -103,7 +177,7 @@ def glue_convert_examples_to_features(examples, tokenizer,
 
     """
     is_tf_dataset = False
-    if is_tf_available() and isinstance(examples, tf.data.Dataset):
+    if _IS_TF and isinstance(examples, tf.data.Dataset):
         is_tf_dataset = True
 
     if task is not None:
@@ -115,58 +189,111 @@ def glue_convert_examples_to_features(examples, tokenizer,
             output_mode = glue_output_modes[task]
             logger.info("Using output mode %s for task %s" % (output_mode, task))
 
-    label_map = {label: i for i, label in enumerate(label_list)}
+    if is_tf_dataset:
+        examples = [processor.tfds_map(processor.get_example_from_tensor_dict(example)) for example in examples]
+
+    if isinstance(examples, ExampleBatch):
+        batch = examples
+    else:
+        batch = ExampleBatch.from_examples(examples)
+
+    # Tokenize every example in one batch_encode_plus call (the batch API the
+    # pinned transformers 2.3.0 provides) and leave the output unpadded;
+    # padding and the masks are assembled vectorized below.
+    if batch.texts_b is None:
+        texts = batch.texts_a
+    else:
+        texts = list(zip(batch.texts_a, batch.texts_b))
+    token_lists = tokenizer.batch_encode_plus(
+        texts,
+        add_special_tokens=True,
+        max_length=max_length,
+    )["input_ids"]
+    lengths = np.fromiter((len(token_ids) for token_ids in token_lists), dtype=np.int64, count=len(batch))
+
+    # Truncate at the 95th percentile of the observed token lengths (rounded
+    # up to a multiple of 8) rather than the caller's max_length; tweets
+    # rarely come anywhere near 512, so this cuts the sequence length fed to
+    # every downstream transformer layer. The lengths come from the single
+    # tokenization pass above, not a separate survey pass.
+    if len(batch) > 0:
+        p95 = int(np.percentile(lengths, 95))
+        eff_max_length = min(max_length, ((p95 + 7) // 8) * 8)
+        if lengths.max() > eff_max_length:
+            # Re-truncate only the tail examples, keeping their final
+            # separator token in place.
+            for i in np.nonzero(lengths > eff_max_length)[0]:
+                token_ids = token_lists[i][:eff_max_length]
+                token_ids[-1] = token_lists[i][-1]
+                token_lists[i] = token_ids
+            lengths = np.minimum(lengths, eff_max_length)
+    else:
+        eff_max_length = max_length
+    logger.info("Using effective max length %d (95th percentile, cap %d)" % (eff_max_length, max_length))
+
+    # Pad to the longest sequence actually present (rounded up to a multiple
+    # of 8 for tensor-core friendly shapes) instead of always to the cap.
+    if len(batch) > 0:
+        padded_length = int(min(eff_max_length, ((lengths.max() + 7) // 8) * 8))
+    else:
+        padded_length = eff_max_length
+    logger.info("Padding examples to length %d (max_length %d)" % (padded_length, max_length))
+
+    # Pad all rows in one preallocated int matrix. The mask has 1 for real
+    # tokens and 0 for padding tokens. Only real tokens are attended to.
+    input_ids_arr = np.full((len(batch), padded_length), pad_token, dtype=np.int64)
+    positions = np.arange(padded_length)
+    if pad_on_left:
+        real_token_mask = (positions[None, :] >= padded_length - lengths[:, None]).astype(np.int32)
+        for i, token_ids in enumerate(token_lists):
+            input_ids_arr[i, padded_length - len(token_ids):] = token_ids
+    else:
+        real_token_mask = (positions[None, :] < lengths[:, None]).astype(np.int32)
+        for i, token_ids in enumerate(token_lists):
+            input_ids_arr[i, :len(token_ids)] = token_ids
+    if mask_padding_with_zero:
+        attention_mask_arr = real_token_mask
+    else:
+        attention_mask_arr = 1 - real_token_mask
+    # The segment ids from the tokenizer are replaced by the example's
+    # environment id on real tokens and pad_token_segment_id on padding,
+    # in one vectorized pass instead of a Python list per example.
+    env_arr = np.asarray(batch.envs, dtype=np.int32)
+    token_type_ids_arr = _stamp_token_type_ids(real_token_mask, env_arr, pad_token_segment_id)
+
+    # Map all labels in one C-level pass instead of a dict lookup per example.
+    if output_mode == "classification":
+        codes = pd.Categorical(batch.labels, categories=label_list).codes
+        if (codes == -1).any():
+            unknown = sorted(set(label for label, code in zip(batch.labels, codes) if code == -1))
+            raise KeyError("Labels %s not in label list %s" % (unknown, label_list))
+        label_ids = codes.astype(np.int64)
+    elif output_mode == "regression":
+        label_ids = np.fromiter((float(label) for label in batch.labels), dtype=np.float32, count=len(batch))
+    else:
+        raise KeyError(output_mode)
 
     features = []
-    for (ex_index, example) in enumerate(examples):
+    for ex_index in range(len(batch)):
         if ex_index % 10000 == 0:
             logger.info("Writing example %d" % (ex_index))
-        if is_tf_dataset:
-            example = processor.get_example_from_tensor_dict(example)
-            example = processor.tfds_map(example)
 
+        # Every row of the feature matrices is padded_length wide by
+        # construction, so no per-example length asserts (and their
+        # eagerly-built messages) are needed here.
+        input_ids = input_ids_arr[ex_index].tolist()
+        attention_mask = attention_mask_arr[ex_index].tolist()
+        token_type_ids = token_type_ids_arr[ex_index].tolist()
 
-        inputs = tokenizer.encode_plus(
-            example.text_a,
-            example.text_b,
-            add_special_tokens=True,
-            max_length=max_length,
-        )
-        input_ids, token_type_ids = inputs["input_ids"], inputs["token_type_ids"]
-
-        # The mask has 1 for real tokens and 0 for padding tokens. Only real
-        # tokens are attended to.
-        attention_mask = [1 if mask_padding_with_zero else 0] * len(input_ids)
-
-        # Zero-pad up to the sequence length.
-        padding_length = max_length - len(input_ids)
-        if pad_on_left:
-            input_ids = ([pad_token] * padding_length) + input_ids
-            attention_mask = ([0 if mask_padding_with_zero else 1] * padding_length) + attention_mask
-            token_type_ids = ([pad_token_segment_id] * padding_length) + ([example.env] * len(token_type_ids))
-        else:
-            input_ids = input_ids + ([pad_token] * padding_length)
-            attention_mask = attention_mask + ([0 if mask_padding_with_zero else 1] * padding_length)
-            token_type_ids = ([example.env] * len(token_type_ids)) + ([pad_token_segment_id] * padding_length)
-
-        assert len(input_ids) == max_length, "Error with input length {} vs {}".format(len(input_ids), max_length)
-        assert len(attention_mask) == max_length, "Error with input length {} vs {}".format(len(attention_mask), max_length)
-        assert len(token_type_ids) == max_length, "Error with input length {} vs {}".format(len(token_type_ids), max_length)
-
-        if output_mode == "classification":
-            label = label_map[example.label]
-        elif output_mode == "regression":
-            label = float(example.label)
-        else:
-            raise KeyError(output_mode) 
+        label = label_ids[ex_index].item()
 
         if ex_index < 5:
             logger.info("*** Example ***")
-            logger.info("guid: %s" % (example.guid))
+            logger.info("guid: %s" % (batch.guids[ex_index]))
             logger.info("input_ids: %s" % " ".join([str(x) for x in input_ids]))
             logger.info("attention_mask: %s" % " ".join([str(x) for x in attention_mask]))
             logger.info("token_type_ids: %s" % " ".join([str(x) for x in token_type_ids]))
-            logger.info("label: %s (id = %d)" % (example.label, label))
+            logger.info("label: %s (id = %d)" % (batch.labels[ex_index], label))
 
         features.append(
                 InputFeatures(input_ids=input_ids,
@@ -174,28 +301,22 @@ def glue_convert_examples_to_features(examples, tokenizer,
                               token_type_ids=token_type_ids,
                               label=label))
 
-    if is_tf_available() and is_tf_dataset:
-        def gen():
-            for ex in features:
-                yield ({'input_ids': ex.input_ids,
-                         'attention_mask': ex.attention_mask,
-                         'token_type_ids': ex.token_type_ids},
-                        ex.label)
-
-        return tf.data.Dataset.from_generator(gen,
-            ({'input_ids': tf.int32,
-              'attention_mask': tf.int32,
-              'token_type_ids': tf.int32},
-             tf.int64),
-            ({'input_ids': tf.TensorShape([None]),
-              'attention_mask': tf.TensorShape([None]),
-              'token_type_ids': tf.TensorShape([None])},
-             tf.TensorShape([])))
+    if _IS_TF and is_tf_dataset:
+        # from_tensor_slices keeps dataset iteration inside the TF C++
+        # runtime instead of calling back into a Python generator for every
+        # example, forever.
+        return tf.data.Dataset.from_tensor_slices(
+            ({'input_ids': input_ids_arr.astype(np.int32),
+              'attention_mask': attention_mask_arr.astype(np.int32),
+              'token_type_ids': token_type_ids_arr.astype(np.int32)},
+             label_ids.astype(np.int64)))
 
     return features
 
 class ToxicNewProcessor(DataProcessor):
     """Processor for the SST-2 data set (GLUE version)."""
+    _USECOLS = ('tweet', 'ND_label')
+    _DTYPES = None
 
     def get_example_from_tensor_dict(self, tensor_dict):
         """See base class."""
@@ -207,14 +328,14 @@ class ToxicNewProcessor(DataProcessor):
         )
 
     def read_csv(self, input_file, quotechar='"'):
-        """Reads a tab separated value file."""
-        df = pd.read_csv(input_file)
+        """Reads only the columns _create_examples consumes."""
+        df = pd.read_csv(input_file, usecols=list(self._USECOLS), dtype=self._DTYPES)
         return df
 
     def read_txt(self, input_file):
-        """Reads a tab separated value file."""
+        """Streams a text file line by line."""
         with open(input_file, "r", encoding="utf-8-sig") as f:
-            return list(f)
+            yield from f
 
     def get_train_examples(self, data_dir):
         """See base class."""
@@ -238,26 +359,73 @@ class ToxicNewProcessor(DataProcessor):
 
     def _create_examples(self, df, set_type):
         """Creates examples for the training and dev sets."""
-        examples = []
-        for (i, line) in enumerate(zip(df.tweet, df.ND_label)):
-            guid = "%s-%s" % (set_type, i)
-            text_a = line[0]
-            label = str(line[1])
-            examples.append(InputExample(guid=guid, text_a=text_a, text_b=None, label=label))
-        return examples
+        return [
+            InputExample(guid="%s-%s" % (set_type, i), text_a=tweet, text_b=None, label=str(label))
+            for i, (tweet, label) in enumerate(df[['tweet', 'ND_label']].itertuples(index=False, name=None))
+        ]
 
 
-class ToxicEnvProcessor(DataProcessor):
-    """Processor for the SST-2 data set (GLUE version)."""
-    env2id = {"aav":0, "hispanic":1, "white":2, "other":3}
+def _compile_wordlist_re(wordlist):
+    """Compiles a wordlist into a single word-bounded alternation. The
+    entries are regex patterns themselves (e.g. "gays?", "jew\\w*"), so they
+    are joined as-is, not escaped."""
+    return re.compile(r"\b(?:" + "|".join(wordlist) + r")\b", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=None)
+def _mention_wordlists():
+    """Loads the three bias wordlists, only once the mention env is used."""
     df_word = pd.read_csv("word_based_bias_list.csv")
     noi_wordlist = df_word[df_word.categorization=='harmless-minority'].word.tolist()
     oi_wordlist = df_word[df_word.categorization=='offensive-minority-reference'].word.tolist()
     oni_wordlist = df_word[df_word.categorization=='offensive-not-minority'].word.tolist()
+    return noi_wordlist, oi_wordlist, oni_wordlist
+
 
-    idtyRe = re.compile(r"\b"+r"\b|\b".join(noi_wordlist)+"\b",re.IGNORECASE)
-    oiRe = re.compile(r"\b"+r"\b|\b".join(oi_wordlist)+"\b",re.IGNORECASE)
-    oniRe = re.compile(r"\b"+r"\b|\b".join(oni_wordlist)+"\b",re.IGNORECASE)
+@functools.lru_cache(maxsize=None)
+def _mention_regexes():
+    """Compiles the three wordlist regexes once, shared by all processors."""
+    return tuple(_compile_wordlist_re(wordlist) for wordlist in _mention_wordlists())
+
+
+def _is_word_boundary(ch):
+    """True when ch cannot be part of a regex \\w word."""
+    return not (ch.isalnum() or ch == '_')
+
+
+@functools.lru_cache(maxsize=None)
+def _mention_automaton():
+    """Builds the Aho-Corasick automaton over the two literal wordlists
+    once, shared by all processors. The harmless-minority entries are regex
+    patterns the automaton cannot represent, so they stay on the regex path.
+    Returns None when pyahocorasick is not installed."""
+    if ahocorasick is None:
+        return None
+    _, oi_wordlist, oni_wordlist = _mention_wordlists()
+    automaton = ahocorasick.Automaton()
+    # oni first so a word in both lists keeps the higher-priority oi tag.
+    for env, wordlist in ((2, oni_wordlist), (1, oi_wordlist)):
+        for word in wordlist:
+            automaton.add_word(word.lower(), (env, len(word)))
+    automaton.make_automaton()
+    return automaton
+
+
+# Rows below this are classified in-process; the pool only pays off once the
+# per-row automaton/regex work outweighs the worker startup cost.
+_PARALLEL_MIN_ROWS = 10000
+
+
+def _mention_envs_chunk(tweets):
+    """Worker for parallel mention-env classification over a slice of tweets."""
+    return [ToxicEnvProcessor._mention_env(tweet) for tweet in tweets]
+
+
+class ToxicEnvProcessor(DataProcessor):
+    """Processor for the SST-2 data set (GLUE version)."""
+    env2id = {"aav":0, "hispanic":1, "white":2, "other":3}
+    _USECOLS = ('tweet', 'ND_label', 'dialect_argmax')
+    _DTYPES = {'dialect_argmax': 'category'}
 
     def get_example_from_tensor_dict(self, tensor_dict):
         """See base class."""
@@ -270,14 +438,14 @@ class ToxicEnvProcessor(DataProcessor):
         )
 
     def read_csv(self, input_file, quotechar='"'):
-        """Reads a tab separated value file."""
-        df = pd.read_csv(input_file)
+        """Reads only the columns _create_examples consumes."""
+        df = pd.read_csv(input_file, usecols=list(self._USECOLS), dtype=self._DTYPES)
         return df
 
     def read_txt(self, input_file):
-        """Reads a tab separated value file."""
+        """Streams a text file line by line."""
         with open(input_file, "r", encoding="utf-8-sig") as f:
-            return list(f)
+            yield from f
 
     def get_train_examples(self, data_dir, env_type='dialect'):
         """See base class."""
@@ -300,33 +468,72 @@ class ToxicEnvProcessor(DataProcessor):
         """See base class."""
         return ["0", "1"]
 
+    @classmethod
+    def _mention_env(cls, text):
+        """Maps a tweet to a mention environment: 0 for harmless-minority,
+        1 for offensive-minority-reference, 2 for offensive-not-minority,
+        3 for no mention. The harmless-minority patterns always go through
+        their regex (they cannot be spelt as literals); the two literal
+        wordlists use a single Aho-Corasick pass with word-boundary checks
+        when pyahocorasick is available, otherwise their regexes."""
+        idtyRe, oiRe, oniRe = _mention_regexes()
+        if idtyRe.search(text) is not None:
+            return 0
+        automaton = _mention_automaton()
+        if automaton is not None:
+            env = 3
+            lowered = text.lower()
+            for end, (cat, word_len) in automaton.iter(lowered):
+                # Enforce \b semantics on both edges of the match.
+                start = end - word_len + 1
+                if start > 0 and not _is_word_boundary(lowered[start - 1]):
+                    continue
+                if end + 1 < len(lowered) and not _is_word_boundary(lowered[end + 1]):
+                    continue
+                if cat < env:
+                    env = cat
+                    if env == 1:
+                        break
+            return env
+        if oiRe.search(text) is not None:
+            return 1
+        elif oniRe.search(text) is not None:
+            return 2
+        else:
+            return 3
+
     def _create_examples(self, df, set_type, env_type='dialect'):
-        """Creates examples for the training and dev sets."""
-        examples = []
-        for (i, line) in enumerate(zip(df.tweet, df.ND_label, df.dialect_argmax)):
-            guid = "%s-%s" % (set_type, i)
-            text_a = line[0]
-            label = str(line[1])
-            if env_type == 'dialect':
-                env = line[2]
-                env = ToxicEnvProcessor.env2id[env]
-            elif env_type == 'aae':
-                env = line[2]
-                env = 1 if env == 'aae' else 0 #ToxicEnvProcessor.env2id[env]
-            elif env_type == 'mention':
-                if len(ToxicEnvProcessor.idtyRe.findall(line[0]))>0:
-                    env = 0
-                elif len(ToxicEnvProcessor.oiRe.findall(line[0]))>0:
-                    env = 1
-                elif len(ToxicEnvProcessor.oniRe.findall(line[0]))>0:
-                    env = 2
-                else:
-                    env = 3
+        """Creates a column batch for the training and dev sets."""
+        # Environment ids are computed column-wise up front so no per-example
+        # Python objects are built at all.
+        if env_type == 'dialect':
+            envs = df.dialect_argmax.map(ToxicEnvProcessor.env2id).to_numpy(dtype=np.int32)
+        elif env_type == 'aae':
+            envs = (df.dialect_argmax == 'aae').to_numpy(dtype=np.int32)
+        elif env_type == 'mention':
+            tweets = df.tweet.tolist()
+            n_workers = min(os.cpu_count() or 1, 8)
+            if len(tweets) >= _PARALLEL_MIN_ROWS and n_workers > 1:
+                # Each worker classifies a contiguous slice, so concatenating
+                # the chunk results preserves the row order.
+                chunk_size = -(-len(tweets) // n_workers)
+                chunks = [tweets[i:i + chunk_size] for i in range(0, len(tweets), chunk_size)]
+                with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                    envs = np.fromiter(
+                        (env for chunk_envs in executor.map(_mention_envs_chunk, chunks) for env in chunk_envs),
+                        dtype=np.int32, count=len(tweets))
             else:
-                raise(ValueError("False Env Type: " + env_type))
-
-            examples.append(EnvInputExample(guid=guid, text_a=text_a, text_b=None, label=label, env=env))
-        return examples
+                envs = np.fromiter((ToxicEnvProcessor._mention_env(tweet) for tweet in tweets), dtype=np.int32, count=len(tweets))
+        else:
+            raise(ValueError("False Env Type: " + env_type))
+
+        return ExampleBatch(
+            guids=["%s-%s" % (set_type, i) for i in range(len(df))],
+            texts_a=df.tweet.tolist(),
+            texts_b=None,
+            labels=[str(label) for label in df.ND_label.tolist()],
+            envs=envs,
+        )
 
 
 class ToxicProcessor(DataProcessor):
@@ -342,14 +549,14 @@ class ToxicProcessor(DataProcessor):
         )
 
     def read_csv(self, input_file, quotechar='"'):
-        """Reads a tab separated value file."""
+        """Streams a comma separated value file row by row."""
         with open(input_file, "r", encoding="utf-8-sig") as f:
-            return list(csv.reader(f, delimiter=",", quotechar=quotechar))
+            yield from csv.reader(f, delimiter=",", quotechar=quotechar)
 
     def read_txt(self, input_file):
-        """Reads a tab separated value file."""
+        """Streams a text file line by line."""
         with open(input_file, "r", encoding="utf-8-sig") as f:
-            return list(f)
+            yield from f
 
     def get_train_examples(self, data_dir):
         """See base class."""
@@ -374,9 +581,8 @@ class ToxicProcessor(DataProcessor):
     def _create_examples(self, lines, set_type):
         """Creates examples for the training and dev sets."""
         examples = []
-        for (i, line) in enumerate(lines):
-            if i == 0:
-                continue
+        next(lines, None)  # header row
+        for (i, line) in enumerate(lines, 1):
             guid = "%s-%s" % (set_type, i)
             text_a = line[-2]
             label = line[-1]
@@ -397,14 +603,14 @@ class ToxicTransProcessor(DataProcessor):
         )
 
     def read_csv(self, input_file, quotechar='"'):
-        """Reads a tab separated value file."""
+        """Streams a comma separated value file row by row."""
         with open(input_file, "r", encoding="utf-8-sig") as f:
-            return list(csv.reader(f, delimiter=",", quotechar=quotechar))
+            yield from csv.reader(f, delimiter=",", quotechar=quotechar)
 
     def read_txt(self, input_file):
-        """Reads a tab separated value file."""
+        """Streams a text file line by line."""
         with open(input_file, "r", encoding="utf-8-sig") as f:
-            return list(f)
+            yield from f
 
     def get_train_examples(self, data_dir):
         """See base class."""
@@ -429,9 +635,8 @@ class ToxicTransProcessor(DataProcessor):
     def _create_examples(self, lines, set_type):
         """Creates examples for the training and dev sets."""
         examples = []
-        for (i, line) in enumerate(lines):
-            if i == 0:
-                continue
+        next(lines, None)  # header row
+        for (i, line) in enumerate(lines, 1):
             guid = "%s-%s" % (set_type, i)
             text_a = line[-2]
             label = line[-1]
@@ -441,9 +646,8 @@ class ToxicTransProcessor(DataProcessor):
     def _create_examples_trans(self, lines, set_type):
         """Creates examples for the training and dev sets."""
         examples = []
-        for (i, line) in enumerate(lines):
-            if i == 0:
-                continue
+        next(lines, None)  # header row
+        for (i, line) in enumerate(lines, 1):
             guid = "%s-%s" % (set_type, i)
             text_a = line[17]
             text_trans = line[18]
@@ -465,14 +669,14 @@ class ToxicTransreProcessor(DataProcessor):
         )
 
     def read_csv(self, input_file, quotechar='"'):
-        """Reads a tab separated value file."""
+        """Streams a comma separated value file row by row."""
         with open(input_file, "r", encoding="utf-8-sig") as f:
-            return list(csv.reader(f, delimiter=",", quotechar=quotechar))
+            yield from csv.reader(f, delimiter=",", quotechar=quotechar)
 
     def read_txt(self, input_file):
-        """Reads a tab separated value file."""
+        """Streams a text file line by line."""
         with open(input_file, "r", encoding="utf-8-sig") as f:
-            return list(f)
+            yield from f
 
     def get_train_examples(self, data_dir):
         """See base class."""
@@ -497,9 +701,8 @@ class ToxicTransreProcessor(DataProcessor):
     def _create_examples(self, lines, set_type):
         """Creates examples for the training and dev sets."""
         examples = []
-        for (i, line) in enumerate(lines):
-            if i == 0:
-                continue
+        next(lines, None)  # header row
+        for (i, line) in enumerate(lines, 1):
             guid = "%s-%s" % (set_type, i)
             text_a = line[-2]
             label = line[-1]
@@ -509,9 +712,8 @@ class ToxicTransreProcessor(DataProcessor):
     def _create_examples_trans(self, lines, set_type):
         """Creates examples for the training and dev sets."""
         examples = []
-        for (i, line) in enumerate(lines):
-            if i == 0:
-                continue
+        next(lines, None)  # header row
+        for (i, line) in enumerate(lines, 1):
             guid = "%s-%s" % (set_type, i)
             text_a = line[17]
             text_trans = line[18]
@@ -533,14 +735,14 @@ class ToxicEvalProcessor(DataProcessor):
         )
 
     def read_csv(self, input_file, quotechar='"'):
-        """Reads a tab separated value file."""
+        """Streams a comma separated value file row by row."""
         with open(input_file, "r", encoding="utf-8-sig") as f:
-            return list(csv.reader(f, delimiter=",", quotechar=quotechar))
+            yield from csv.reader(f, delimiter=",", quotechar=quotechar)
 
     def read_txt(self, input_file):
-        """Reads a tab separated value file."""
+        """Streams a text file line by line."""
         with open(input_file, "r", encoding="utf-8-sig") as f:
-            return list(f)
+            yield from f
 
     def get_train_examples(self, data_dir):
         """See base class."""
@@ -565,9 +767,8 @@ class ToxicEvalProcessor(DataProcessor):
     def _create_examples(self, lines, set_type):
         """Creates examples for the training and dev sets."""
         examples = []
-        for (i, line) in enumerate(lines):
-            if i == 0:
-                continue
+        next(lines, None)  # header row
+        for (i, line) in enumerate(lines, 1):
             guid = "%s-%s" % (set_type, i)
             text_a = line[9]
             text_a_trans = line[11]
@@ -579,9 +780,8 @@ class ToxicEvalProcessor(DataProcessor):
     def _create_examples_s(self, lines, set_type):
         """Creates examples for the training and dev sets."""
         examples = []
-        for (i, line) in enumerate(lines):
-            if i == 0:
-                continue
+        next(lines, None)  # header row
+        for (i, line) in enumerate(lines, 1):
             guid = "%s-%s" % (set_type, i)
             line = line.strip()
             line = line.split('\001')
@@ -592,6 +792,8 @@ class ToxicEvalProcessor(DataProcessor):
 
 class ToxicDavisonProcessor(DataProcessor):
     """Processor for the SST-2 data set (GLUE version)."""
+    _USECOLS = ('tweet', 'ND_label')
+    _DTYPES = None
 
     def get_example_from_tensor_dict(self, tensor_dict):
         """See base class."""
@@ -603,14 +805,14 @@ class ToxicDavisonProcessor(DataProcessor):
         )
 
     def read_csv(self, input_file, quotechar='"'):
-        """Reads a tab separated value file."""
-        df = pd.read_csv(input_file)
+        """Reads only the columns _create_examples consumes."""
+        df = pd.read_csv(input_file, usecols=list(self._USECOLS), dtype=self._DTYPES)
         return df
 
     def read_txt(self, input_file):
-        """Reads a tab separated value file."""
+        """Streams a text file line by line."""
         with open(input_file, "r", encoding="utf-8-sig") as f:
-            return list(f)
+            yield from f
 
     def get_train_examples(self, data_dir):
         """See base class."""
@@ -634,13 +836,10 @@ class ToxicDavisonProcessor(DataProcessor):
 
     def _create_examples(self, df, set_type):
         """Creates examples for the training and dev sets."""
-        examples = []
-        for (i, line) in enumerate(zip(df.tweet, df.ND_label)):
-            guid = "%s-%s" % (set_type, i)
-            text_a = line[0]
-            label = str(line[1])
-            examples.append(InputExample(guid=guid, text_a=text_a, text_b=None, label=label))
-        return examples
+        return [
+            InputExample(guid="%s-%s" % (set_type, i), text_a=tweet, text_b=None, label=str(label))
+            for i, (tweet, label) in enumerate(df[['tweet', 'ND_label']].itertuples(index=False, name=None))
+        ]
 
 
 